@@ -0,0 +1,245 @@
+from fastapi import APIRouter
+
+# Import the shared state and helpers from the core module
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from core import (
+    applications_db, status_counts, source_counts, weekly_counts, state_lock,
+    count_recent_applications, cached_json
+)
+
+# Stats and analytics endpoints shared by the API apps
+router = APIRouter()
+
+@router.get("/applications/stats/summary")
+async def get_stats():
+    """Get statistics about applications"""
+    if not applications_db:
+        return {
+            "total": 0,
+            "by_status": {},
+            "by_source": {}
+        }
+    
+    # Read the stats straight from the materialized counters
+    async with state_lock:
+        status_count = dict(status_counts)
+        source_count = {source: data["total"] for source, data in source_counts.items()}
+    
+    return {
+        "total": len(applications_db),
+        "by_status": status_count,
+        "by_source": source_count
+    }
+
+# ============================================
+# ANALYTICS ENDPOINTS
+# ============================================
+
+@router.get("/analytics/dashboard")
+async def get_dashboard_stats():
+    """
+    Calculate dashboard statistics from in-memory applications
+    Returns: total apps, response rate, interview rate, offer rate, weekly apps
+    """
+    return await cached_json(_build_dashboard_stats)
+
+def _build_dashboard_stats():
+    """Build the /analytics/dashboard payload"""
+    if not applications_db:
+        return {
+            "total_applications": 0,
+            "response_rate": 0.0,
+            "interview_rate": 0.0,
+            "offer_rate": 0.0,
+            "applications_this_week": 0
+        }
+    
+    total = len(applications_db)
+    
+    # Responses, interviews and offers come straight from the status counters
+    offers = status_counts.get('offer', 0)
+    interviewed = status_counts.get('interview', 0) + offers
+    responded = status_counts.get('phone_screen', 0) + interviewed
+    
+    # Calculate rates
+    response_rate = (responded / total * 100) if total > 0 else 0.0
+    interview_rate = (interviewed / total * 100) if total > 0 else 0.0
+    offer_rate = (offers / total * 100) if total > 0 else 0.0
+    
+    # Count applications this week
+    applications_this_week = count_recent_applications()
+    
+    return {
+        "total_applications": total,
+        "response_rate": round(response_rate, 2),
+        "interview_rate": round(interview_rate, 2),
+        "offer_rate": round(offer_rate, 2),
+        "applications_this_week": applications_this_week
+    }
+
+@router.get("/analytics/funnel")
+async def get_funnel_data():
+    """Calculate application funnel stages"""
+    return await cached_json(_build_funnel_data)
+
+def _build_funnel_data():
+    """Build the /analytics/funnel payload"""
+    if not applications_db:
+        return {"stages": [], "total": 0}
+    
+    total = len(applications_db)
+    
+    # Count each status independently (not cumulatively)
+    applied = status_counts.get('applied', 0)
+    phone_screen = status_counts.get('phone_screen', 0)
+    interview = status_counts.get('interview', 0)
+    offer = status_counts.get('offer', 0)
+    rejected = status_counts.get('rejected', 0)
+    
+    stages = [
+        {
+            "stage": "Applied", 
+            "count": applied, 
+            "percentage": round((applied / total * 100) if total > 0 else 0, 2)
+        },
+        {
+            "stage": "Phone Screen", 
+            "count": phone_screen, 
+            "percentage": round((phone_screen / total * 100) if total > 0 else 0, 2)
+        },
+        {
+            "stage": "Interview", 
+            "count": interview, 
+            "percentage": round((interview / total * 100) if total > 0 else 0, 2)
+        },
+        {
+            "stage": "Offer", 
+            "count": offer, 
+            "percentage": round((offer / total * 100) if total > 0 else 0, 2)
+        },
+        {
+            "stage": "Rejected", 
+            "count": rejected, 
+            "percentage": round((rejected / total * 100) if total > 0 else 0, 2)
+        }
+    ]
+    
+    return {"stages": stages, "total": total}
+
+@router.get("/analytics/sources")
+async def get_source_analytics():
+    """
+    Group applications by source and calculate success rates
+    Returns: source name, count, response rate, interview rate
+    """
+    return await cached_json(_build_source_analytics)
+
+def _build_source_analytics():
+    """Build the /analytics/sources payload"""
+    if not applications_db:
+        return {"sources": []}
+    
+    # Calculate rates
+    sources = []
+    for source, data in source_counts.items():
+        total = data["total"]
+        sources.append({
+            "source": source,
+            "total_applications": total,
+            "response_rate": round((data["responded"] / total * 100) if total > 0 else 0, 2),
+            "interview_rate": round((data["interviewed"] / total * 100) if total > 0 else 0, 2),
+            "offer_rate": round((data["offers"] / total * 100) if total > 0 else 0, 2)
+        })
+    
+    # Sort by total applications
+    sources.sort(key=lambda x: x["total_applications"], reverse=True)
+    
+    return {"sources": sources}
+
+@router.get("/analytics/status-distribution")
+async def get_status_distribution():
+    """
+    Count applications by status
+    Returns: status name, count, percentage
+    """
+    return await cached_json(_build_status_distribution)
+
+def _build_status_distribution():
+    """Build the /analytics/status-distribution payload"""
+    if not applications_db:
+        return {"distribution": [], "total": 0}
+    
+    total = len(applications_db)
+    
+    # Create distribution list
+    distribution = []
+    for status, count in status_counts.items():
+        distribution.append({
+            "status": status,
+            "count": count,
+            "percentage": round((count / total * 100) if total > 0 else 0, 2)
+        })
+    
+    # Sort by count
+    distribution.sort(key=lambda x: x["count"], reverse=True)
+    
+    return {
+        "distribution": distribution,
+        "total": total
+    }
+
+@router.get("/analytics/weekly-trends")
+async def get_weekly_trends():
+    """
+    Group applications by week and show trends
+    Returns: week, applications count, response rate
+    """
+    return await cached_json(_build_weekly_trends)
+
+def _build_weekly_trends():
+    """Build the /analytics/weekly-trends payload"""
+    if not applications_db:
+        return {"weeks": []}
+    
+    # Create weeks list
+    weeks = []
+    for week, data in sorted(weekly_counts.items()):
+        total = data["total"]
+        weeks.append({
+            "week_start": week,
+            "applications": total,
+            "responses": data["responded"],
+            "response_rate": round((data["responded"] / total * 100) if total > 0 else 0, 2)
+        })
+    
+    return {"weeks": weeks}
+
+@router.get("/analytics/response-timeline")
+async def get_response_timeline():
+    """
+    Calculate weekly response rates over time
+    Returns: week, response rate, interview rate, offer rate
+    """
+    return await cached_json(_build_response_timeline)
+
+def _build_response_timeline():
+    """Build the /analytics/response-timeline payload"""
+    if not applications_db:
+        return {"timeline": []}
+    
+    # Create timeline
+    timeline = []
+    for week, stats in sorted(weekly_counts.items()):
+        total = stats["total"]
+        timeline.append({
+            "week_start": week,
+            "total_applications": total,
+            "response_rate": round((stats["responded"] / total * 100) if total > 0 else 0, 2),
+            "interview_rate": round((stats["interviewed"] / total * 100) if total > 0 else 0, 2),
+            "offer_rate": round((stats["offers"] / total * 100) if total > 0 else 0, 2)
+        })
+    
+    return {"timeline": timeline}
@@ -0,0 +1,257 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Optional, List
+from datetime import datetime
+import orjson
+
+# Import the shared state and helpers from the core module
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from core import (
+    applications_db, applications_by_id, company_status, apps_by_company, apps_by_status,
+    apps_by_source, company_counts, company_status_counts, state_lock,
+    STATUS_CODES, ApplicationStatus, ApplicationSource, ApplicationCreate, ApplicationUpdate,
+    Application, save_data, generate_id, prepare_application, public_application,
+    index_company, index_field, index_filters, count_application,
+    track_applied_date, company_key, bump_db_version, cached_response
+)
+
+# Application CRUD and company endpoints shared by the API apps
+router = APIRouter()
+
+# Application lists longer than this are streamed in chunks of this size
+STREAM_CHUNK_SIZE = 500
+
+async def _stream_json(apps: List[dict]):
+    """Yield a JSON array of applications one chunk at a time"""
+    yield b'['
+    for start in range(0, len(apps), STREAM_CHUNK_SIZE):
+        chunk = b','.join(orjson.dumps(public_application(app))
+                          for app in apps[start:start + STREAM_CHUNK_SIZE])
+        yield (b',' if start else b'') + chunk
+    yield b']'
+
+# ============================================
+# APPLICATION ENDPOINTS
+# ============================================
+
+@router.get("/applications")
+async def get_applications(
+    company: Optional[str] = Query(None, description="Filter by company name (partial match)"),
+    status: Optional[ApplicationStatus] = Query(None, description="Filter by status"),
+    source: Optional[ApplicationSource] = Query(None, description="Filter by application source"),
+    search: Optional[str] = Query(None, description="Search by role or keywords"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of applications to return (all when omitted)"),
+    offset: int = Query(0, ge=0, description="Number of matching applications to skip")
+):
+    """Get all applications with optional filters and pagination (total count in X-Total-Count)"""
+    async with state_lock:
+        # Normalize the query once; the stored fields are casefolded at write time
+        company_q = company.casefold() if company else None
+        status_code = STATUS_CODES[status.value] if status else None
+        source_v = source.value if source else None
+        search_q = search.casefold() if search else None
+        
+        if company_q is None and status_code is None and source_v is None and search_q is None:
+            # No filters: skip the per-record predicate checks entirely
+            filtered_apps = applications_db
+        else:
+            # Scan the smallest exact-match bucket instead of the whole list
+            candidates = applications_db
+            if status_code is not None:
+                candidates = apps_by_status.get(status.value, [])
+            if source_v is not None:
+                source_apps = apps_by_source.get(source_v, [])
+                if len(source_apps) < len(candidates):
+                    candidates = source_apps
+            
+            filtered_apps = [app for app in candidates
+                             if (company_q is None or company_q in app['_company_cf'])
+                             and (status_code is None or app['_status_code'] == status_code)
+                             and (source_v is None or app['source'] == source_v)
+                             and (search_q is None
+                                  or search_q in app['_role_cf']
+                                  or search_q in app['_company_cf']
+                                  or search_q in app['_notes_cf'])]
+        
+        # Slicing also snapshots the page, so it can be encoded after the lock is released
+        total = len(filtered_apps)
+        page = filtered_apps[offset:offset + limit if limit is not None else None]
+    
+    headers = {"X-Total-Count": str(total)}
+    
+    # Records were validated on write, so skip response_model validation
+    if len(page) <= STREAM_CHUNK_SIZE:
+        return ORJSONResponse([public_application(app) for app in page], headers=headers)
+    
+    # Large lists are encoded chunk by chunk instead of as one response body
+    return StreamingResponse(_stream_json(page), media_type="application/json", headers=headers)
+
+@router.get("/applications/{application_id}")
+async def get_application(application_id: str):
+    """Get a specific application by ID"""
+    app = applications_by_id.get(application_id)
+    if app is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    
+    # Same as the list endpoint: stored records are already valid
+    return ORJSONResponse(public_application(app))
+
+@router.post("/applications", response_model=Application, status_code=201)
+async def create_application(application: ApplicationCreate):
+    """Create a new application"""
+    async with state_lock:
+        new_app = application.model_dump()
+        new_app['id'] = generate_id()
+        new_app['applied_date'] = new_app['last_updated'] = datetime.now().isoformat()
+        
+        prepare_application(new_app)
+        applications_db.append(new_app)
+        applications_by_id[new_app['id']] = new_app
+        index_company(new_app, 1)
+        index_filters(new_app, 1)
+        count_application(new_app, 1)
+        track_applied_date(new_app, 1)
+        bump_db_version()
+        save_data()  # Save after creating
+    
+    return new_app
+
+@router.put("/applications/{application_id}", response_model=Application)
+async def update_application(application_id: str, application: ApplicationUpdate):
+    """Update an existing application"""
+    async with state_lock:
+        app = applications_by_id.get(application_id)
+        if app is None:
+            raise HTTPException(status_code=404, detail="Application not found")
+        
+        # Prepare the updated record first, so a bad value fails before any counter moves
+        updated = {**app, **application.model_dump(exclude_unset=True)}
+        prepare_application(updated)
+        
+        # The record is shared with applications_db and the indexes, so update it in place
+        old_company_key = app['_company_cf']
+        old_status, old_source = app['status'], app['source']
+        count_application(app, -1)
+        app.update(updated)
+        count_application(app, 1)
+        if app['_company_cf'] != old_company_key:
+            index_company(app, -1, old_company_key)
+            index_company(app, 1)
+        if app['status'] != old_status:
+            index_field(apps_by_status, old_status, app, -1)
+            index_field(apps_by_status, app['status'], app, 1)
+        if app['source'] != old_source:
+            index_field(apps_by_source, old_source, app, -1)
+            index_field(apps_by_source, app['source'], app, 1)
+        bump_db_version()
+        
+        app['last_updated'] = datetime.now().isoformat()
+        save_data()  # Save after updating
+    return app
+
+@router.delete("/applications/{application_id}")
+async def delete_application(application_id: str):
+    """Delete an application"""
+    async with state_lock:
+        deleted_app = applications_by_id.pop(application_id, None)
+        if deleted_app is None:
+            raise HTTPException(status_code=404, detail="Application not found")
+        
+        applications_db.remove(deleted_app)
+        index_company(deleted_app, -1)
+        index_filters(deleted_app, -1)
+        count_application(deleted_app, -1)
+        track_applied_date(deleted_app, -1)
+        bump_db_version()
+        save_data()  # Save after deleting
+    return {"message": "Application deleted successfully", "deleted": public_application(deleted_app)}
+
+# ============================================
+# COMPANY ENDPOINTS
+# ============================================
+
+@router.get("/companies")
+async def get_companies(
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of companies to return (all when omitted)"),
+    offset: int = Query(0, ge=0, description="Number of companies to skip")
+):
+    """Get all companies with stats, optionally paginated"""
+    payload = await cached_response(_build_companies)
+    companies = payload["companies"]
+    return ORJSONResponse({
+        "companies": companies[offset:offset + limit if limit is not None else None],
+        "total": len(companies)
+    })
+
+def _build_companies():
+    """Build the /companies payload"""
+    if not applications_db:
+        return {"companies": []}
+    
+    companies = []
+    
+    # Stats come from the per-company counters; buckets are oldest first
+    for key, company_apps in apps_by_company.items():
+        data = company_counts[key]
+        total = data["total"]
+        company_name = company_apps[0]['company']
+        latest_app = company_apps[-1]
+        
+        companies.append({
+            "company_name": company_name,
+            "application_count": total,
+            "response_rate": round((data["responded"] / total * 100) if total > 0 else 0, 2),
+            "interview_rate": round((data["interviewed"] / total * 100) if total > 0 else 0, 2),
+            "offer_rate": round((data["offers"] / total * 100) if total > 0 else 0, 2),
+            "latest_application": public_application(latest_app),
+            "status": company_status.get(key, "")
+        })
+    
+    companies.sort(key=lambda x: x["application_count"], reverse=True)
+    return {"companies": companies}
+
+@router.get("/companies/{company_name}/stats")
+async def get_company_stats(
+    company_name: str,
+    include_roles: bool = Query(False, description="Include every application for the company in roles_applied")
+):
+    """Get detailed stats for a specific company (roles_applied only on request)"""
+    async with state_lock:
+        key = company_key(company_name)
+        company_apps = apps_by_company.get(key)
+        
+        if not company_apps:
+            raise HTTPException(status_code=404, detail="Company not found")
+        
+        # Counts come from the per-company counters; the roles still need the bucket
+        stats = dict(company_counts[key])
+        status_breakdown = dict(company_status_counts[key])
+        roles_applied = [public_application(app) for app in company_apps] if include_roles else None
+        first_application = company_apps[0]['applied_date']
+    
+    total = stats["total"]
+    
+    return ORJSONResponse({
+        "company_name": company_name,
+        "overview": {
+            "application_count": total,
+            "response_rate": round((stats["responded"] / total * 100) if total > 0 else 0, 2),
+            "interview_rate": round((stats["interviewed"] / total * 100) if total > 0 else 0, 2),
+            "offer_rate": round((stats["offers"] / total * 100) if total > 0 else 0, 2)
+        },
+        "status_breakdown": status_breakdown,
+        "roles_applied": roles_applied,
+        "first_application": first_application
+    })
+
+@router.put("/companies/{company_name}/status")
+async def update_company_status(company_name: str, status_update: dict):
+    """Update company status (dream_company, interested, etc.)"""
+    async with state_lock:
+        status = company_status[company_key(company_name)] = status_update.get("status", "")
+        bump_db_version()
+        save_data()  # Save after updating
+    return {"company_name": company_name, "status": status}
@@ -1,23 +1,43 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict
 from datetime import datetime
+from functools import lru_cache
+from collections import Counter
+from operator import itemgetter
 from enum import Enum
+import orjson
 
-# Import the applications_db from applications module
+# Import the applications_db from the core module
 import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 
-app = FastAPI(title="Companies API")
+import core
 
-# In-memory storage for company metadata
-company_notes: Dict[str, str] = {}
-company_contacts: Dict[str, List[dict]] = {}
-company_status: Dict[str, str] = {}
+# Applications and company metadata are shared with the applications API
+from core import (
+    applications_db, apps_by_company, company_notes, company_contacts, company_status, state_lock,
+    load_data, company_key, public_application, bump_stats, bump_db_version,
+    cached_json, current_etag
+)
 
-# Reference to applications_db (will be imported)
-applications_db: List[dict] = []
+app = FastAPI(title="Companies API", default_response_class=ORJSONResponse)
+
+# Compress larger JSON responses (company lists, per-company applications)
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
+# Last issued contact id per company (by company_key)
+company_contact_counter: Dict[str, int] = {}
+
+# Load data on startup
+@app.on_event("startup")
+async def startup_event():
+    """Load data when app starts"""
+    async with state_lock:
+        load_data()
 
 # Enums
 class CompanyStatus(str, Enum):
@@ -27,10 +47,15 @@ class CompanyStatus(str, Enum):
     not_interested = "not_interested"
 
 # Pydantic models
+# Request bodies reject unknown fields instead of silently dropping them
 class CompanyNotesUpdate(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    
     notes: str = Field(..., max_length=2000)
 
 class CompanyContact(BaseModel):
+    model_config = ConfigDict(extra='forbid', str_strip_whitespace=True)
+    
     name: str = Field(..., min_length=1, max_length=100)
     role: str = Field(..., min_length=1, max_length=100)
     email: Optional[str] = None
@@ -39,14 +64,11 @@ class CompanyContact(BaseModel):
     notes: Optional[str] = None
 
 class CompanyStatusUpdate(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    
     status: CompanyStatus
 
 # Helper functions
-def get_company_applications(company_name: str) -> List[dict]:
-    """Get all applications for a specific company"""
-    return [app for app in applications_db 
-            if app['company'].lower() == company_name.lower()]
-
 def calculate_company_stats(applications: List[dict]) -> dict:
     """Calculate statistics for a company's applications"""
     if not applications:
@@ -57,21 +79,18 @@ def calculate_company_stats(applications: List[dict]) -> dict:
             "offer_rate": 0.0
         }
     
-    total = len(applications)
-    
-    responded = sum(1 for app in applications 
-                   if app['status'] in ['phone_screen', 'interview', 'offer'])
+    # One pass; the cached status code is tested against the status-group bitmasks
+    counts = {"total": 0, "responded": 0, "interviewed": 0, "offers": 0}
+    for app in applications:
+        bump_stats(counts, app['_status_code'], 1)
     
-    interviewed = sum(1 for app in applications 
-                     if app['status'] in ['interview', 'offer'])
-    
-    offers = sum(1 for app in applications if app['status'] == 'offer')
+    total = counts["total"]
     
     return {
         "application_count": total,
-        "response_rate": round((responded / total * 100) if total > 0 else 0, 2),
-        "interview_rate": round((interviewed / total * 100) if total > 0 else 0, 2),
-        "offer_rate": round((offers / total * 100) if total > 0 else 0, 2)
+        "response_rate": round((counts["responded"] / total * 100) if total > 0 else 0, 2),
+        "interview_rate": round((counts["interviewed"] / total * 100) if total > 0 else 0, 2),
+        "offer_rate": round((counts["offers"] / total * 100) if total > 0 else 0, 2)
     }
 
 def get_latest_application(applications: List[dict]) -> Optional[dict]:
@@ -79,12 +98,8 @@ def get_latest_application(applications: List[dict]) -> Optional[dict]:
     if not applications:
         return None
     
-    # Sort by applied_date and get the latest
-    sorted_apps = sorted(applications, 
-                        key=lambda x: datetime.fromisoformat(x['applied_date']), 
-                        reverse=True)
-    
-    latest = sorted_apps[0]
+    # Company buckets are ordered by applied date
+    latest = applications[-1]
     return {
         "role": latest['role'],
         "status": latest['status'],
@@ -92,53 +107,102 @@ def get_latest_application(applications: List[dict]) -> Optional[dict]:
         "application_id": latest['id']
     }
 
+@lru_cache(maxsize=4096)
+def company_summary(key: str, version: int) -> tuple:
+    """Memoized (stats, latest application) for one company at one db_version"""
+    # Old versions are never looked up again, so bumping the version invalidates for free
+    company_apps = core.apps_by_company.get(key, [])
+    return calculate_company_stats(company_apps), get_latest_application(company_apps)
+
 # API Routes
+# The read endpoints return ORJSONResponse directly so FastAPI skips jsonable_encoder
 
 @app.get("/")
-def root():
+async def root():
     """Root endpoint"""
     return {"message": "Companies API", "version": "1.0"}
 
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response when the client already holds the current version"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    
+    # If-None-Match is "*" or a list of tags, compared weakly (ignoring W/)
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
 @app.get("/companies")
-def get_companies():
+async def get_companies(request: Request):
     """
     Get list of all unique companies with aggregated stats
     Returns: company name, application count, rates, latest application
     """
-    if not applications_db:
-        return {"companies": [], "total": 0}
+    etag = current_etag()
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    
+    response = await cached_json(_build_companies)
+    response.headers["ETag"] = etag
+    return response
+
+@app.get("/companies/stream")
+async def stream_companies():
+    """
+    Stream all companies as NDJSON, one company per line (unsorted)
+    """
+    # Only the keys are snapshotted; each row is built from the live index as it is sent
+    async with state_lock:
+        keys = list(apps_by_company)
     
-    # Get unique companies using a set
-    unique_companies = set(app['company'] for app in applications_db)
+    return StreamingResponse(_stream_company_rows(keys), media_type="application/x-ndjson")
+
+async def _stream_company_rows(keys: List[str]):
+    """Yield one encoded company row per line"""
+    for key in keys:
+        # Writes can empty (and drop) a bucket between rows, so look it up under the lock
+        async with state_lock:
+            company_apps = apps_by_company.get(key)
+            if not company_apps:
+                continue
+            row = _company_row(company_apps)
+        yield orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+
+def _company_row(company_apps: List[dict]) -> dict:
+    """Build the /companies row for one company's application bucket (call under state_lock)"""
+    company_name = company_apps[0]['company']
+    key = company_apps[0]['_company_cf']
     
-    companies_list = []
+    # Stats and latest application
+    stats, latest = company_summary(key, core.db_version)
     
-    for company_name in unique_companies:
-        # Get all applications for this company
-        company_apps = get_company_applications(company_name)
-        
-        # Calculate stats
-        stats = calculate_company_stats(company_apps)
-        
-        # Get latest application
-        latest = get_latest_application(company_apps)
-        
-        # Get company metadata
-        notes = company_notes.get(company_name, "")
-        status = company_status.get(company_name, None)
-        contact_count = len(company_contacts.get(company_name, []))
-        
-        companies_list.append({
-            "company_name": company_name,
-            "application_count": stats["application_count"],
-            "response_rate": stats["response_rate"],
-            "interview_rate": stats["interview_rate"],
-            "offer_rate": stats["offer_rate"],
-            "latest_application": latest,
-            "status": status,
-            "has_notes": bool(notes),
-            "contact_count": contact_count
-        })
+    # Get company metadata
+    notes = company_notes.get(key, "")
+    status = company_status.get(key, None)
+    contact_count = len(company_contacts.get(key, {}))
+    
+    return {
+        "company_name": company_name,
+        "application_count": stats["application_count"],
+        "response_rate": stats["response_rate"],
+        "interview_rate": stats["interview_rate"],
+        "offer_rate": stats["offer_rate"],
+        "latest_application": latest,
+        "status": status,
+        "has_notes": bool(notes),
+        "contact_count": contact_count
+    }
+
+def _build_companies():
+    """Build the /companies payload"""
+    if not applications_db:
+        return {"companies": [], "total": 0}
+    
+    # Walk the shared company index; each bucket already holds that company's applications
+    companies_list = [_company_row(company_apps) for company_apps in apps_by_company.values()]
     
     # Sort by application count (descending)
     companies_list.sort(key=lambda x: x["application_count"], reverse=True)
@@ -149,98 +213,104 @@ def get_companies():
     }
 
 @app.get("/companies/{company_name}")
-def get_company_applications_endpoint(company_name: str):
+async def get_company_applications_endpoint(company_name: str, request: Request):
     """
     Get all applications for a specific company
     """
-    company_apps = get_company_applications(company_name)
+    key = company_key(company_name)
+    company_apps = apps_by_company.get(key)
     
     if not company_apps:
         raise HTTPException(status_code=404, detail="Company not found or no applications exist")
     
-    return {
+    # Checked after the lookup so an unknown company is still a 404
+    etag = current_etag()
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    
+    return ORJSONResponse({
         "company_name": company_name,
-        "applications": company_apps,
+        "applications": [public_application(app) for app in company_apps],
         "total": len(company_apps)
-    }
+    }, headers={"ETag": etag})
 
 @app.get("/companies/{company_name}/stats")
-def get_company_stats(company_name: str):
+async def get_company_stats(
+    company_name: str,
+    include_roles: bool = Query(False, description="Include the per-application roles_applied list")
+):
     """
     Calculate detailed statistics for a specific company
+    roles_applied is only built when include_roles is set
     """
-    company_apps = get_company_applications(company_name)
+    key = company_key(company_name)
+    company_apps = apps_by_company.get(key)
     
     if not company_apps:
         raise HTTPException(status_code=404, detail="Company not found or no applications exist")
     
-    stats = calculate_company_stats(company_apps)
+    stats, _ = company_summary(key, core.db_version)
     
-    # Additional detailed stats
-    status_breakdown = {}
-    source_breakdown = {}
-    roles_applied = []
+    # Additional detailed stats; Counter over map() keeps the counting loop in C
+    status_breakdown = Counter(map(itemgetter('status'), company_apps))
+    source_breakdown = Counter(map(itemgetter('source'), company_apps))
     
-    for app in company_apps:
-        # Count by status
-        status = app['status']
-        status_breakdown[status] = status_breakdown.get(status, 0) + 1
-        
-        # Count by source
-        source = app['source']
-        source_breakdown[source] = source_breakdown.get(source, 0) + 1
-        
-        # Collect roles
-        roles_applied.append({
+    # Collect roles, newest first; the bucket is already ordered by applied date
+    roles_applied = [
+        {
             "role": app['role'],
             "status": app['status'],
             "applied_date": app['applied_date']
-        })
-    
-    # Sort roles by date
-    roles_applied.sort(key=lambda x: datetime.fromisoformat(x['applied_date']), reverse=True)
+        }
+        for app in reversed(company_apps)
+    ] if include_roles else None
     
-    return {
+    return ORJSONResponse({
         "company_name": company_name,
         "overview": stats,
-        "status_breakdown": status_breakdown,
-        "source_breakdown": source_breakdown,
+        "status_breakdown": dict(status_breakdown),
+        "source_breakdown": dict(source_breakdown),
         "roles_applied": roles_applied,
-        "first_application": company_apps[-1]['applied_date'] if company_apps else None,
-        "latest_application": company_apps[0]['applied_date'] if company_apps else None
-    }
+        "first_application": company_apps[0]['applied_date'] if company_apps else None,
+        "latest_application": company_apps[-1]['applied_date'] if company_apps else None
+    })
 
 @app.get("/companies/{company_name}/details")
-def get_company_details(company_name: str):
+async def get_company_details(company_name: str):
     """
     Get all metadata for a specific company (notes, contacts, status)
     """
-    company_apps = get_company_applications(company_name)
+    key = company_key(company_name)
+    company_apps = apps_by_company.get(key)
     
     if not company_apps:
         raise HTTPException(status_code=404, detail="Company not found or no applications exist")
     
-    return {
+    return ORJSONResponse({
         "company_name": company_name,
-        "notes": company_notes.get(company_name, ""),
-        "contacts": company_contacts.get(company_name, []),
-        "status": company_status.get(company_name, None),
+        "notes": company_notes.get(key, ""),
+        "contacts": list(company_contacts.get(key, {}).values()),
+        "status": company_status.get(key, None),
         "application_count": len(company_apps)
-    }
+    })
 
 @app.put("/companies/{company_name}/notes")
-def update_company_notes(company_name: str, notes_data: CompanyNotesUpdate):
+async def update_company_notes(company_name: str, notes_data: CompanyNotesUpdate):
     """
     Update notes for a company (stored in-memory)
     """
     # Verify company exists in applications
-    company_apps = get_company_applications(company_name)
+    key = company_key(company_name)
+    company_apps = apps_by_company.get(key)
     
     if not company_apps:
         raise HTTPException(status_code=404, detail="Company not found or no applications exist")
     
     # Update notes in memory
-    company_notes[company_name] = notes_data.notes
+    async with state_lock:
+        company_notes[key] = notes_data.notes
+        bump_db_version()
     
     return {
         "message": "Notes updated successfully",
@@ -249,26 +319,33 @@ def update_company_notes(company_name: str, notes_data: CompanyNotesUpdate):
     }
 
 @app.post("/companies/{company_name}/contacts")
-def add_company_contact(company_name: str, contact: CompanyContact):
+async def add_company_contact(company_name: str, contact: CompanyContact):
     """
     Add a contact for a company (stored in-memory)
     """
     # Verify company exists in applications
-    company_apps = get_company_applications(company_name)
+    key = company_key(company_name)
+    company_apps = apps_by_company.get(key)
     
     if not company_apps:
         raise HTTPException(status_code=404, detail="Company not found or no applications exist")
     
-    # Initialize contacts list if not exists
-    if company_name not in company_contacts:
-        company_contacts[company_name] = []
-    
-    # Add contact
-    contact_dict = contact.dict()
-    contact_dict['id'] = str(len(company_contacts[company_name]) + 1)
-    contact_dict['created_at'] = datetime.now().isoformat()
-    
-    company_contacts[company_name].append(contact_dict)
+    async with state_lock:
+        # Initialize contacts if not exists
+        contacts = company_contacts.setdefault(key, {})
+        
+        # Ids come from a per-company counter so they are never reused after a delete
+        if key not in company_contact_counter:
+            company_contact_counter[key] = max((int(cid) for cid in contacts), default=0)
+        company_contact_counter[key] += 1
+        
+        # Add contact
+        contact_dict = contact.model_dump()
+        contact_dict['id'] = str(company_contact_counter[key])
+        contact_dict['created_at'] = datetime.now().isoformat()
+        
+        contacts[contact_dict['id']] = contact_dict
+        bump_db_version()
     
     return {
         "message": "Contact added successfully",
@@ -277,38 +354,42 @@ def add_company_contact(company_name: str, contact: CompanyContact):
     }
 
 @app.delete("/companies/{company_name}/contacts/{contact_id}")
-def delete_company_contact(company_name: str, contact_id: str):
+async def delete_company_contact(company_name: str, contact_id: str):
     """
     Delete a contact for a company
     """
-    if company_name not in company_contacts:
-        raise HTTPException(status_code=404, detail="Company has no contacts")
-    
-    contacts = company_contacts[company_name]
-    
-    for idx, contact in enumerate(contacts):
-        if contact['id'] == contact_id:
-            deleted_contact = contacts.pop(idx)
-            return {
-                "message": "Contact deleted successfully",
-                "deleted": deleted_contact
-            }
-    
-    raise HTTPException(status_code=404, detail="Contact not found")
+    async with state_lock:
+        key = company_key(company_name)
+        if key not in company_contacts:
+            raise HTTPException(status_code=404, detail="Company has no contacts")
+        
+        deleted_contact = company_contacts[key].pop(contact_id, None)
+        
+        if deleted_contact is None:
+            raise HTTPException(status_code=404, detail="Contact not found")
+        
+        bump_db_version()
+    return {
+        "message": "Contact deleted successfully",
+        "deleted": deleted_contact
+    }
 
 @app.put("/companies/{company_name}/status")
-def update_company_status(company_name: str, status_data: CompanyStatusUpdate):
+async def update_company_status(company_name: str, status_data: CompanyStatusUpdate):
     """
     Update status for a company (stored in-memory)
     """
     # Verify company exists in applications
-    company_apps = get_company_applications(company_name)
+    key = company_key(company_name)
+    company_apps = apps_by_company.get(key)
     
     if not company_apps:
         raise HTTPException(status_code=404, detail="Company not found or no applications exist")
     
     # Update status in memory
-    company_status[company_name] = status_data.status.value
+    async with state_lock:
+        company_status[key] = status_data.status.value
+        bump_db_version()
     
     return {
         "message": "Status updated successfully",
@@ -320,4 +401,7 @@ def update_company_status(company_name: str, status_data: CompanyStatusUpdate):
 # from companies import app as companies_app
 # app.mount("/api/companies", companies_app)
 
-# Run standalone with: uvicorn companies:app --reload --port 8001
\ No newline at end of file
+# Run standalone with: uvicorn companies:app --reload --port 8001
+# Production: uvicorn companies:app --loop uvloop --http httptools --port 8001
+# Keep --workers at 1: applications and company metadata live in this process and
+# each worker would hold (and persist) its own diverging copy
@@ -0,0 +1,423 @@
+from fastapi import Response
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List, Dict, Deque, Tuple
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from enum import Enum
+from collections import deque
+from bisect import insort
+import asyncio
+import tempfile
+import time
+import orjson
+import os
+import stat
+import sys
+
+# Shared state, models and helpers for the Job Applications API routers
+
+# File path for persistent storage
+DATA_FILE = "applications_data.json"
+
+# os.umask() can only be read by setting it, so do that once at import
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Writes only mark the data dirty; a background task coalesces them into
+# one file write at most every SAVE_DEBOUNCE_SECONDS
+SAVE_DEBOUNCE_SECONDS = 0.25
+_dirty: Optional[asyncio.Event] = None
+_persist_task: Optional[asyncio.Task] = None
+_persist_stopping = False
+# Set by save_data(), cleared when the writer snapshots; the event only wakes the writer
+_pending = False
+# Cleared by apps that keep their data in memory only (the analytics API)
+persistence_enabled = True
+
+# In-memory storage; company metadata is keyed by company_key()
+applications_db: List[dict] = []
+applications_by_id: Dict[str, dict] = {}
+company_notes: Dict[str, str] = {}
+company_contacts: Dict[str, Dict[str, dict]] = {}
+company_status: Dict[str, str] = {}
+
+# Applications grouped by casefolded company name, status and source
+apps_by_company: Dict[str, List[dict]] = {}
+apps_by_status: Dict[str, List[dict]] = {}
+apps_by_source: Dict[str, List[dict]] = {}
+
+# Last issued application id (guarded by state_lock, like the rest of the state)
+_next_id = 0
+
+# Materialized analytics counters, kept in sync by every write
+status_counts: Dict[str, int] = {}
+source_counts: Dict[str, Dict[str, int]] = {}
+weekly_counts: Dict[str, Dict[str, int]] = {}
+# Per-company stats buckets and status breakdowns, keyed like apps_by_company
+company_counts: Dict[str, Dict[str, int]] = {}
+company_status_counts: Dict[str, Dict[str, int]] = {}
+# (applied timestamp, id) of applications from the last week, oldest first
+recent_applications: Deque[Tuple[float, str]] = deque()
+WEEK_SECONDS = 7 * 24 * 60 * 60
+
+# Bumped on every write; cached responses are keyed by it, plus a TTL
+# window since applications_this_week also moves with the clock
+db_version = 0
+CACHE_TTL_SECONDS = 5
+
+# db_version starts over at 0 on restart, so ETags also carry a per-process prefix
+_ETAG_PREFIX = format(time.time_ns(), 'x')
+
+# Define Enums for status and source
+class ApplicationStatus(str, Enum):
+    applied = "applied"
+    phone_screen = "phone_screen"
+    interview = "interview"
+    rejected = "rejected"
+    offer = "offer"
+
+class ApplicationSource(str, Enum):
+    linkedin = "LinkedIn"
+    indeed = "Indeed"
+    company_website = "Company Website"
+    referral = "Referral"
+    other = "Other"
+
+# Small-int status codes (declaration order) so status groups are bitmask tests
+STATUS_CODES = {status.value: code for code, status in enumerate(ApplicationStatus)}
+RESPONDED_MASK = 0b10110    # phone_screen, interview, offer
+INTERVIEWED_MASK = 0b10100  # interview, offer
+OFFER_MASK = 0b10000        # offer
+
+# Pydantic models
+class ApplicationBase(BaseModel):
+    company: str = Field(..., min_length=1, max_length=200)
+    role: str = Field(..., min_length=1, max_length=200)
+    status: ApplicationStatus
+    source: ApplicationSource
+    location: Optional[str] = None
+    salary_range: Optional[str] = None
+    notes: Optional[str] = None
+
+class ApplicationCreate(ApplicationBase):
+    pass
+
+class ApplicationUpdate(BaseModel):
+    company: Optional[str] = None
+    role: Optional[str] = None
+    status: Optional[ApplicationStatus] = None
+    source: Optional[ApplicationSource] = None
+    location: Optional[str] = None
+    salary_range: Optional[str] = None
+    notes: Optional[str] = None
+    
+    @field_validator('company', 'role', 'status', 'source')
+    @classmethod
+    def reject_null(cls, value):
+        """These fields can be omitted but not cleared"""
+        if value is None:
+            raise ValueError("may not be null")
+        return value
+
+class Application(ApplicationBase):
+    id: str
+    applied_date: str
+    last_updated: str
+
+# Guards applications_db and everything derived from it. Handlers run on the
+# event loop and never await while holding it, so critical sections stay short.
+# This does not cross processes: multiple workers would need shared storage.
+state_lock = asyncio.Lock()
+
+# ============================================
+# PERSISTENCE FUNCTIONS
+# ============================================
+
+def serialize_data() -> bytes:
+    """Serialize all data for the JSON file (call under state_lock)"""
+    data = {
+        "applications": [public_application(app) for app in applications_db],
+        "company_notes": company_notes,
+        "company_contacts": company_contacts,
+        "company_status": company_status
+    }
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+def write_data(payload: bytes):
+    """Write serialized data to JSON file"""
+    # Write a temp file next to the data file and swap it in, so a crash
+    # mid-write never leaves a truncated data file behind
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(DATA_FILE) or '.',
+                                         prefix='.applications_', suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # NamedTemporaryFile creates the file owner-only; keep the existing file's
+        # mode (it holds contact details), or what open() would have used
+        try:
+            mode = stat.S_IMODE(os.stat(DATA_FILE).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, DATA_FILE)
+        print(f"✅ Data saved to {DATA_FILE}")
+    except Exception as e:
+        print(f"❌ Error saving data: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def save_data():
+    """Schedule a save of all data to JSON file (call under state_lock)"""
+    global _pending
+    if not persistence_enabled:
+        return
+    if _persist_task is None or _persist_task.done():
+        # No background writer running, so save synchronously
+        write_data(serialize_data())
+        return
+    _pending = True
+    _dirty.set()
+
+async def _persist_forever():
+    """Flush pending data to disk, coalescing writes that arrive within the debounce window"""
+    global _pending
+    while True:
+        await _dirty.wait()
+        if not _persist_stopping:
+            await asyncio.sleep(SAVE_DEBOUNCE_SECONDS)
+        _dirty.clear()
+        if _pending:
+            # Snapshot on the loop under the lock; only the disk write goes to a thread
+            async with state_lock:
+                _pending = False
+                payload = serialize_data()
+            await asyncio.to_thread(write_data, payload)
+        # A save that landed during the write set _pending again, so go round once more
+        if _persist_stopping and not _pending:
+            return
+
+async def start_persistence():
+    """Start the background writer on the running event loop"""
+    global _dirty, _persist_task, _persist_stopping
+    _dirty = asyncio.Event()
+    _persist_stopping = False
+    _persist_task = asyncio.create_task(_persist_forever())
+
+async def stop_persistence():
+    """Flush pending changes, if any, and stop the background writer"""
+    global _persist_task, _persist_stopping
+    if _persist_task is None:
+        return
+    _persist_stopping = True
+    _dirty.set()
+    await _persist_task
+    _persist_task = None
+
+def load_data():
+    """Load data from JSON file"""
+    # Containers are refilled in place because the routers import them by reference
+    data = {}
+    if os.path.exists(DATA_FILE):
+        try:
+            with open(DATA_FILE, 'rb') as f:
+                data = orjson.loads(f.read())
+            print(f"✅ Loaded {len(data.get('applications', []))} applications from {DATA_FILE}")
+        except Exception as e:
+            print(f"❌ Error loading data: {e}")
+            # Initialize with empty data if load fails
+            data = {}
+    else:
+        print(f"ℹ️ No existing data file found. Starting fresh.")
+    
+    applications_db[:] = data.get("applications", [])
+    # Older data files keyed company metadata by the name as typed
+    company_notes.clear()
+    company_notes.update({company_key(name): notes for name, notes in data.get("company_notes", {}).items()})
+    company_contacts.clear()
+    # Contacts are keyed by id; older data files stored them as a list
+    company_contacts.update({
+        company_key(name): contacts if isinstance(contacts, dict) else {c['id']: c for c in contacts}
+        for name, contacts in data.get("company_contacts", {}).items()
+    })
+    company_status.clear()
+    company_status.update({company_key(name): status for name, status in data.get("company_status", {}).items()})
+    rebuild_indexes()
+
+# ============================================
+# HELPER FUNCTIONS
+# ============================================
+
+def generate_id() -> str:
+    """Generate unique ID for application (call under state_lock)"""
+    global _next_id
+    _next_id += 1
+    return str(_next_id)
+
+def get_week_start(date_str: str) -> str:
+    """Get the start of week (Monday) for a given date"""
+    # Only the YYYY-MM-DD prefix matters, which also makes the cache hit rate high
+    return _week_start_of_day(date_str[:10])
+
+@lru_cache(maxsize=4096)
+def _week_start_of_day(day: str) -> str:
+    d = date.fromisoformat(day)
+    return (d - timedelta(days=d.weekday())).isoformat()
+
+def company_key(company_name: str) -> str:
+    """Normalize a company name for indexing and metadata lookups"""
+    # Interned so every record and dict key for a company shares one string object
+    return sys.intern(company_name.strip().casefold())
+
+def prepare_application(app: dict):
+    """Cache parsed and casefolded fields on a stored application so reads never recompute them"""
+    app['_applied_ts'] = datetime.fromisoformat(app['applied_date']).timestamp()
+    app['_week_start'] = get_week_start(app['applied_date'])
+    app['_company_cf'] = company_key(app['company'])
+    app['_role_cf'] = app['role'].casefold()
+    app['_notes_cf'] = (app.get('notes') or '').casefold()
+    app['_status_code'] = STATUS_CODES[app['status']]
+
+def public_application(app: dict) -> dict:
+    """Strip the cached underscore fields before an application leaves the API"""
+    return {key: value for key, value in app.items() if not key.startswith('_')}
+
+def bump_stats(stats: Dict[str, int], status_code: int, delta: int):
+    """Add delta to a total/responded/interviewed/offers bucket"""
+    bit = 1 << status_code
+    stats["total"] += delta
+    if bit & RESPONDED_MASK:
+        stats["responded"] += delta
+    if bit & INTERVIEWED_MASK:
+        stats["interviewed"] += delta
+    if bit & OFFER_MASK:
+        stats["offers"] += delta
+
+def _bump_bucket(buckets: Dict[str, Dict[str, int]], key: str, status_code: int, delta: int):
+    """Apply delta to one keyed bucket, dropping it once it is empty"""
+    if key not in buckets:
+        buckets[key] = {"total": 0, "responded": 0, "interviewed": 0, "offers": 0}
+    bump_stats(buckets[key], status_code, delta)
+    if not buckets[key]["total"]:
+        del buckets[key]
+
+def _id_order(app: dict) -> int:
+    return int(app['id'])
+
+def _applied_order(app: dict) -> Tuple[float, int]:
+    return (app['_applied_ts'], int(app['id']))
+
+def index_field(index: Dict[str, List[dict]], key: str, app: dict, delta: int, order=_id_order):
+    """Add (delta=1) or remove (delta=-1) an application from one bucket of an index"""
+    if delta > 0:
+        # Buckets stay sorted (by default in id order, matching applications_db);
+        # new applications sort last, so insort is normally an append
+        insort(index.setdefault(key, []), app, key=order)
+    else:
+        index[key].remove(app)
+        if not index[key]:
+            del index[key]
+
+def index_company(app: dict, delta: int, key: Optional[str] = None):
+    """Add (delta=1) or remove (delta=-1) an application from its company bucket"""
+    # Company buckets are ordered by applied date, so first and latest are the ends
+    index_field(apps_by_company, key or app['_company_cf'], app, delta, _applied_order)
+
+def index_filters(app: dict, delta: int):
+    """Add (delta=1) or remove (delta=-1) an application from its status and source buckets"""
+    index_field(apps_by_status, app['status'], app, delta)
+    index_field(apps_by_source, app['source'], app, delta)
+
+def _bump_count(counts: Dict[str, int], key: str, delta: int):
+    """Apply delta to one counter, dropping it once it reaches zero"""
+    counts[key] = counts.get(key, 0) + delta
+    if not counts[key]:
+        del counts[key]
+
+def count_application(app: dict, delta: int):
+    """Add (delta=1) or remove (delta=-1) an application from the counters"""
+    status = app['status']
+    key = app['_company_cf']
+    
+    _bump_count(status_counts, status, delta)
+    _bump_bucket(source_counts, app['source'], app['_status_code'], delta)
+    _bump_bucket(weekly_counts, app['_week_start'], app['_status_code'], delta)
+    _bump_bucket(company_counts, key, app['_status_code'], delta)
+    
+    breakdown = company_status_counts.setdefault(key, {})
+    _bump_count(breakdown, status, delta)
+    if not breakdown:
+        del company_status_counts[key]
+
+def track_applied_date(app: dict, delta: int):
+    """Add a new application to (delta=1) or remove one from (delta=-1) the recent window"""
+    entry = (app['_applied_ts'], app['id'])
+    if delta > 0:
+        # New applications are always the newest, so the deque stays ordered
+        recent_applications.append(entry)
+    elif entry in recent_applications:
+        recent_applications.remove(entry)
+
+def count_recent_applications() -> int:
+    """Count applications from the last 7 days, dropping entries that have aged out"""
+    cutoff = time.time() - WEEK_SECONDS
+    while recent_applications and recent_applications[0][0] < cutoff:
+        recent_applications.popleft()
+    return len(recent_applications)
+
+def current_etag() -> str:
+    """Weak ETag for responses that only change when db_version does"""
+    return f'W/"{_ETAG_PREFIX}-{db_version}"'
+
+def bump_db_version():
+    """Invalidate cached responses after a write (call under state_lock)"""
+    global db_version
+    db_version += 1
+
+async def cached_response(build) -> dict:
+    """Return the cached payload of a read-heavy endpoint, rebuilding it after writes"""
+    async with state_lock:
+        return _cached_build(build, db_version, int(time.monotonic() // CACHE_TTL_SECONDS))
+
+@lru_cache(maxsize=32)
+def _cached_build(build, version: int, window: int) -> dict:
+    # Stale versions and windows are never asked for again and age out of the LRU
+    return build()
+
+async def cached_json(build) -> Response:
+    """Like cached_response, but reuses the encoded JSON body as well"""
+    async with state_lock:
+        body = _cached_json(build, db_version, int(time.monotonic() // CACHE_TTL_SECONDS))
+    return Response(content=body, media_type="application/json")
+
+@lru_cache(maxsize=32)
+def _cached_json(build, version: int, window: int) -> bytes:
+    return orjson.dumps(_cached_build(build, version, window))
+
+def rebuild_indexes():
+    """Recompute the id and company indexes and analytics counters from applications_db"""
+    global _next_id
+    applications_by_id.clear()
+    apps_by_company.clear()
+    apps_by_status.clear()
+    apps_by_source.clear()
+    status_counts.clear()
+    source_counts.clear()
+    weekly_counts.clear()
+    company_counts.clear()
+    company_status_counts.clear()
+    recent_applications.clear()
+    recent = []
+    for app in applications_db:
+        prepare_application(app)
+        applications_by_id[app['id']] = app
+        index_company(app, 1)
+        index_filters(app, 1)
+        count_application(app, 1)
+        recent.append((app['_applied_ts'], app['id']))
+    # Loaded data may be in any order; sort once and let the window trim itself
+    recent_applications.extend(sorted(recent))
+    _next_id = max((int(app['id']) for app in applications_db), default=0)
+    bump_db_version()
@@ -30,7 +30,7 @@ function Companies() {
 
     const fetchCompanyDetails = async (companyName) => {
         try {
-            const response = await fetch(`${API_URL}/companies/${encodeURIComponent(companyName)}/stats`);
+            const response = await fetch(`${API_URL}/companies/${encodeURIComponent(companyName)}/stats?include_roles=true`);
             const data = await response.json();
             setCompanyDetails(data);
             setSelectedCompany(companyName);